@@ -0,0 +1,106 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from provider_module import set_model_provider
+from fixture_module import generate_fixture_set
+from main import run_psychextract
+from ocr_module import load_preprocess_and_extract, preprocess_image, segment_text_lines, crop_regions
+from pool_module import run_psychextract_pool
+from triage_module import get_triage_stats, triage_stats
+
+def count_vision_patches(image_path: str, segment=True, patch_size=14) -> int:
+  """
+  Count the 14x14 vision patches the OCR model sees for a page, with or without line segmentation.
+
+  :param image_path: Path to the input image file.
+  :type image_path: str
+  :param segment: Whether the page is split into text line regions first.
+  :type segment: bool
+  :param patch_size: Side length of a vision patch in pixels.
+  :type patch_size: int
+  :return: The total number of patches across all images sent to the OCR model.
+  :rtype: int
+  """
+  page = preprocess_image(image_path)
+  boxes = segment_text_lines(page) if segment else []
+  images = crop_regions(page, boxes) if boxes else [page]
+  return sum(-(-im.width // patch_size) * -(-im.height // patch_size) for im in images)
+
+def benchmark_ocr(image_paths: list[str]) -> dict:
+  """
+  Compare OCR throughput and vision patch counts of segmented and whole-page OCR.
+
+  :param image_paths: Paths of the pages to transcribe.
+  :type image_paths: list[str]
+  :return: A dictionary with the pages per second and total patches of each mode.
+  :rtype: dict
+  """
+  result = {}
+  for mode, segment in (("segmented", True), ("whole_page", False)):
+    start = time.perf_counter()
+    for image_path in image_paths:
+      load_preprocess_and_extract(image_path, segment=segment)
+    seconds = time.perf_counter() - start
+    result[f"ocr_{mode}_docs_per_second"] = len(image_paths) / seconds
+    result[f"ocr_{mode}_patches"] = sum(count_vision_patches(path, segment) for path in image_paths)
+  return result
+
+def run_benchmark(num_docs=8, num_workers=None, threads_per_worker=1, provider="offline") -> dict:
+  """
+  Measure end-to-end pipeline throughput on synthetic handwriting pages,
+  once serially and once with the worker pool, and compare segmented
+  against whole-page OCR.
+
+  :param num_docs: Number of synthetic pages to process.
+  :type num_docs: int
+  :param num_workers: Number of pool workers, or None to fill the machine.
+  :type num_workers: int
+  :param threads_per_worker: Number of torch intra-op threads per pool worker.
+  :type threads_per_worker: int
+  :param provider: The model provider to benchmark, "offline" needs no downloads.
+  :type provider: str
+  :return: A dictionary with the documents per second and the triage statistics of each mode, and the OCR comparison.
+  :rtype: dict
+  """
+  set_model_provider(provider)
+  with tempfile.TemporaryDirectory() as tmp_dir:
+    image_paths = generate_fixture_set(tmp_dir, num_docs)
+    jobs = [(path, str(Path(tmp_dir) / f"output_{i}.wav")) for i, path in enumerate(image_paths)]
+
+    # load the models outside the timed region
+    run_psychextract(*jobs[0])
+    triage_stats.reset()
+
+    start = time.perf_counter()
+    for image_path, output_path in jobs:
+      run_psychextract(image_path, output_path)
+    serial_seconds = time.perf_counter() - start
+    serial_triage = get_triage_stats()
+    triage_stats.reset()
+
+    start = time.perf_counter()
+    run_psychextract_pool(jobs, num_workers, threads_per_worker)
+    pool_seconds = time.perf_counter() - start
+    pool_triage = get_triage_stats()
+
+    ocr = benchmark_ocr(image_paths)
+
+  return {
+    "num_docs": num_docs,
+    "serial_docs_per_second": num_docs / serial_seconds,
+    "pool_docs_per_second": num_docs / pool_seconds,
+    "serial_triage": serial_triage,
+    "pool_triage": pool_triage,
+    **ocr
+  }
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Benchmark PsychExtract pipeline throughput.")
+  parser.add_argument("--docs", type=int, default=8)
+  parser.add_argument("--workers", type=int, default=None)
+  parser.add_argument("--threads-per-worker", type=int, default=1)
+  parser.add_argument("--provider", choices=("offline", "hub"), default="offline")
+  args = parser.parse_args()
+  print(run_benchmark(args.docs, args.workers, args.threads_per_worker, args.provider))
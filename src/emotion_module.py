@@ -1,6 +1,14 @@
 import numpy as np
 import torch
-from transformers import RobertaTokenizerFast, RobertaForSequenceClassification
+from functools import lru_cache
+from tokenizers import Tokenizer, models, pre_tokenizers
+from transformers import (
+  RobertaTokenizerFast,
+  RobertaForSequenceClassification,
+  RobertaConfig,
+  PreTrainedTokenizerFast
+)
+from provider_module import get_model_provider, get_offline_vocab
 
 def get_labels() -> list:
   """
@@ -15,6 +23,47 @@ def get_labels() -> list:
     "sadness", "surprise", "trust"
   ]
 
+def load_offline_emotion_model(num_labels: int, seed=0) -> tuple:
+  """
+  Build a tiny randomly initialized RoBERTa classifier and a word-level tokenizer.
+
+  :param num_labels: Number of emotion labels the classifier predicts.
+  :type num_labels: int
+  :param seed: Seed for the random weight initialization.
+  :type seed: int
+  :return: A tuple containing the stand-in model and tokenizer.
+  :rtype: tuple
+  """
+  vocab = get_offline_vocab()
+  word_level = Tokenizer(models.WordLevel({word: i for i, word in enumerate(vocab)}, unk_token="<unk>"))
+  word_level.pre_tokenizer = pre_tokenizers.Whitespace()
+  tokenizer = PreTrainedTokenizerFast(
+    tokenizer_object=word_level,
+    bos_token="<s>",
+    eos_token="</s>",
+    unk_token="<unk>",
+    pad_token="<pad>",
+    model_max_length=128,
+    model_input_names=["input_ids", "attention_mask"]
+  )
+  torch.manual_seed(seed)
+  model = RobertaForSequenceClassification(RobertaConfig(
+    vocab_size=len(vocab),
+    hidden_size=32,
+    num_hidden_layers=1,
+    num_attention_heads=2,
+    intermediate_size=64,
+    # RoBERTa position ids start after the padding index
+    max_position_embeddings=tokenizer.model_max_length + 2,
+    type_vocab_size=1,
+    pad_token_id=tokenizer.pad_token_id,
+    bos_token_id=tokenizer.bos_token_id,
+    eos_token_id=tokenizer.eos_token_id,
+    problem_type="multi_label_classification",
+    num_labels=num_labels
+  ))
+  return model, tokenizer
+
 def load_emotion_model() -> tuple:
   """
   Load the RoBERTa multi-label emotion classification model and tokenizer.
@@ -22,6 +71,8 @@ def load_emotion_model() -> tuple:
   :return: A tuple containing the loaded model and tokenizer.
   :rtype: tuple
   """
+  if get_model_provider() == "offline":
+    return load_offline_emotion_model(len(get_labels()))
   tokenizer = RobertaTokenizerFast.from_pretrained("roberta-base")
   model = RobertaForSequenceClassification.from_pretrained(
     "cardiffnlp/twitter-roberta-base-emotion-multilabel-latest", 
@@ -30,6 +81,23 @@ def load_emotion_model() -> tuple:
   )
   return model, tokenizer
 
+@lru_cache(maxsize=None)
+def _load_cached_emotion_model(provider: str) -> tuple:
+  model, tokenizer = load_emotion_model()
+  model.eval()
+  return model, tokenizer
+
+def get_emotion_model() -> tuple:
+  """
+  Get the emotion model and tokenizer for the current model provider, loading them only on the first call.
+
+  The cached instances are reused by later calls and inherited by forked worker processes.
+
+  :return: A tuple containing the loaded model and tokenizer.
+  :rtype: tuple
+  """
+  return _load_cached_emotion_model(get_model_provider())
+
 def predict_emotions(text: str, 
                      model: RobertaForSequenceClassification, 
                      tokenizer: RobertaTokenizerFast, 
@@ -84,7 +152,7 @@ def load_and_predict_emotions(text: str) -> dict:
   :return: A dictionary of detected emotions and their probabilities.
   :rtype: dict
   """
-  # Load emotion model and tokenizer
-  model, tokenizer = load_emotion_model()
+  # Get the cached emotion model and tokenizer
+  model, tokenizer = get_emotion_model()
   # Predict emotions from the extracted text
   return predict_emotions(text, model, tokenizer)
\ No newline at end of file
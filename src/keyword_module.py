@@ -1,9 +1,43 @@
 import yake 
 import spacy
+from functools import lru_cache
+from spacy.language import Language
+from provider_module import get_model_provider
 
-def get_nlp():
+@Language.component("offline_noun_tagger")
+def offline_noun_tagger(doc):
+  """
+  Rule-based stand-in for the spaCy tagger and parser: non-stop words are
+  tagged as nouns and the last token of the text is its root.
+  """
+  for token in doc:
+    token.lemma_ = token.lower_
+    token.pos_ = "NOUN" if token.is_alpha and not token.is_stop else "X"
+    token.dep_ = "dep"
+  if len(doc):
+    doc[-1].dep_ = "ROOT"
+  return doc
+
+def load_offline_nlp() -> Language:
+  """
+  Build a blank English spaCy pipeline with the offline noun tagger.
+
+  :return: A spaCy pipeline that needs no downloaded model.
+  :rtype: Language
+  """
+  nlp = spacy.blank("en")
+  nlp.add_pipe("offline_noun_tagger")
+  return nlp
+
+@lru_cache(maxsize=None)
+def _load_cached_nlp(provider: str):
+  if provider == "offline":
+    return load_offline_nlp()
   return spacy.load("en_core_web_sm")
 
+def get_nlp():
+  return _load_cached_nlp(get_model_provider())
+
 def get_yake_extractor() -> yake.KeywordExtractor:
   """
   Initializes and returns a YAKE keyword extractor with specific parameters.
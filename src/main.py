@@ -1,17 +1,25 @@
 # python.exe -m pip install --upgrade pip
 # pip install numpy transformers torch torchvision pillow opencv-python yake spacy pyttsx3
 # python -m spacy download en_core_web_sm
+# set PSYCHEXTRACT_MODEL_PROVIDER=offline to run with tiny stand-in models and no downloads
 
 from ocr_module import load_preprocess_and_extract
 from emotion_module import load_and_predict_emotions
 from keyword_module import extract_and_select_keywords
 from template_module import generate_insight_sentences
 from tts_module import speak
+from triage_module import triage_text, get_default_result, triage_stats
 
 def run_psychextract(image_path: str, output_path: str):
   text = load_preprocess_and_extract(image_path)
   # text = "I noticed how tense my body felt this morning. My shoulders were tight, and I struggled to slow my breathing"
 
+  # skip the heavy models for empty, very short or non-text transcriptions
+  skip_reason = triage_text(text)
+  triage_stats.record(skip_reason)
+  if skip_reason:
+    return get_default_result(text, skip_reason)
+
   emotions = load_and_predict_emotions(text)
 
   keywords = extract_and_select_keywords(text)
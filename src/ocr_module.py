@@ -1,9 +1,13 @@
 import numpy as np
+import torch
 
 from pathlib import Path
+from functools import lru_cache
+from types import SimpleNamespace
 from PIL import Image, ImageOps
 import cv2
-from transformers import Qwen2_5_VLForConditionalGeneration, AutoProcessor
+from transformers import Qwen2_5_VLForConditionalGeneration, AutoProcessor, BatchFeature
+from provider_module import get_model_provider, get_offline_vocab
 
 def preprocess_image(img_path: str, upscale=2.0) -> None:
   """
@@ -45,12 +49,136 @@ def preprocess_image(img_path: str, upscale=2.0) -> None:
   # Convert back to PIL Image
   return Image.fromarray(bw)
     
+class OfflineOCRProcessor:
+  """
+  Stand-in for the Qwen-VL processor that cuts each image into 14x14 patches
+  of ink, so the amount of work grows with the image size like the real vision encoder.
+  """
+  patch_size = 14
+
+  def __init__(self):
+    self.vocab = get_offline_vocab()
+    self.assistant_id = self.vocab.index("assistant")
+    self.tokenizer = SimpleNamespace(padding_side="left")
+
+  def apply_chat_template(self, messages, add_generation_prompt=True):
+    prompt = " ".join(item["text"] for item in messages[0]["content"] if item["type"] == "text")
+    return f"user: <image> {prompt}\nassistant:"
+
+  def __call__(self, text, images, return_tensors="pt", **kwargs):
+    if not isinstance(images, (list, tuple)):
+      images = [images]
+    patches, grids = zip(*(self._patchify(im) for im in images))
+    # like Qwen-VL, the patches of all images are flattened into one tensor
+    # and image_grid_thw records how many belong to each image
+    return BatchFeature({
+      "input_ids": torch.full((len(images), 1), self.assistant_id, dtype=torch.long),
+      "pixel_values": torch.from_numpy(np.concatenate(patches)),
+      "image_grid_thw": torch.tensor(grids, dtype=torch.long)
+    })
+
+  def _patchify(self, image: Image.Image) -> tuple:
+    ink = (np.asarray(image.convert("L")) < 128).astype(np.float32)
+    size = self.patch_size
+    # pad with blank paper up to a whole number of patches
+    rows, cols = -(-ink.shape[0] // size), -(-ink.shape[1] // size)
+    ink = np.pad(ink, ((0, rows * size - ink.shape[0]), (0, cols * size - ink.shape[1])))
+    patches = ink.reshape(rows, size, cols, size).transpose(0, 2, 1, 3).reshape(-1, size * size)
+    return patches, (1, rows, cols)
+
+  def batch_decode(self, sequences, skip_special_tokens=True):
+    # the first four ids are the special tokens
+    return [" ".join(self.vocab[int(i)] for i in row if not (skip_special_tokens and int(i) < 4))
+            for row in sequences]
+
+class OfflineOCRModel(torch.nn.Module):
+  """
+  Tiny randomly initialized stand-in for Qwen-VL: a patch embedding and MLP
+  over every image patch, mean-pooled per image and mapped to vocabulary words.
+  """
+  def __init__(self, vocab_size: int, patch_size=14, hidden_size=64, num_words=8):
+    super().__init__()
+    self.patch_embed = torch.nn.Linear(patch_size * patch_size, hidden_size)
+    self.mlp = torch.nn.Sequential(
+      torch.nn.GELU(),
+      torch.nn.Linear(hidden_size, hidden_size),
+      torch.nn.GELU()
+    )
+    self.head = torch.nn.Linear(hidden_size, vocab_size)
+    self.num_words = num_words
+
+  @property
+  def device(self):
+    return next(self.parameters()).device
+
+  @torch.no_grad()
+  def generate(self, input_ids, pixel_values, image_grid_thw, max_new_tokens=512, **kwargs):
+    pixel_values = pixel_values.to(self.device)
+    hidden = self.mlp(self.patch_embed(pixel_values))
+    counts = image_grid_thw.prod(dim=-1).tolist()
+    pooled = torch.stack([h.mean(dim=0) for h in torch.split(hidden, counts)])
+    logits = self.head(pooled)
+    # never emit the special tokens or the role header
+    logits[:, :5] = float("-inf")
+    words = torch.topk(logits, min(self.num_words, max_new_tokens), dim=-1).indices
+    # blank images transcribe to nothing, like the real model on an empty page
+    has_ink = torch.stack([(p.mean(dim=-1) > 0.02).any() for p in torch.split(pixel_values, counts)])
+    words = torch.where(has_ink.unsqueeze(-1), words, torch.full_like(words, 1))
+    return torch.cat([input_ids.to(self.device), words], dim=-1)
+
+def load_offline_qwen(seed=0) -> tuple:
+  """
+  Build the offline stand-in for the Qwen-VL model and processor.
+
+  :param seed: Seed for the random weight initialization.
+  :type seed: int
+  :return: A tuple containing the stand-in model and processor.
+  :rtype: tuple
+  """
+  torch.manual_seed(seed)
+  processor = OfflineOCRProcessor()
+  model = OfflineOCRModel(len(processor.vocab))
+  model.eval()
+  return model, processor
+
 def load_qwen():
+  if get_model_provider() == "offline":
+    return load_offline_qwen()
   qwen_model_id = "Qwen/Qwen2.5-VL-7B-Instruct"
   processor = AutoProcessor.from_pretrained(qwen_model_id)
+  # decoder-only generation needs left padding when batching prompts;
+  # set once here since the processor is cached and shared between callers
+  processor.tokenizer.padding_side = "left"
   qwen_model = Qwen2_5_VLForConditionalGeneration.from_pretrained(qwen_model_id)
   return qwen_model, processor
 
+def build_ocr_prompt(qwen_tokenizer: AutoProcessor) -> str:
+  """
+  Build the chat-formatted transcription prompt shared by the whole-page and region OCR paths.
+
+  :param qwen_tokenizer: An instance of the Qwen-VL processor.
+  :type qwen_tokenizer: AutoProcessor
+  :return: The prompt with the chat template and generation prompt applied.
+  :rtype: str
+  """
+  prompt = (
+    "Transcribe the handwritten text exactly as it appears. "
+    "Output ONLY the transcription."
+    "No explanations or role labels."
+    "Do not correct spelling, grammar, or punctuation."
+  )
+  messages = [{
+    "role": "user",
+    "content": [
+      {"type": "image"},
+      {"type": "text", "text": prompt}
+    ]
+  }]
+  return qwen_tokenizer.apply_chat_template(
+    messages,
+    add_generation_prompt=True
+  )
+
 def extract_text_from_image(image: Image.Image,
                             qwen_tokenizer: AutoProcessor,
                             qwen_model: Qwen2_5_VLForConditionalGeneration) -> str:
@@ -68,23 +196,7 @@ def extract_text_from_image(image: Image.Image,
   """
 
   try:
-    prompt = (
-      "Transcribe the handwritten text exactly as it appears. "
-      "Output ONLY the transcription."
-      "No explanations or role labels."
-      "Do not correct spelling, grammar, or punctuation."
-    )
-    messages = [{
-      "role": "user",
-      "content": [
-        {"type": "image"},
-        {"type": "text", "text": prompt}
-      ]
-    }]
-    text_input = qwen_tokenizer.apply_chat_template(
-      messages,
-      add_generation_prompt=True
-    )
+    text_input = build_ocr_prompt(qwen_tokenizer)
     inputs = (qwen_tokenizer(text=text_input, images=image, return_tensors="pt")
                             .to(qwen_model.device))
     output = qwen_model.generate(**inputs, max_new_tokens=512)
@@ -96,10 +208,178 @@ def extract_text_from_image(image: Image.Image,
     print(f"Error processing: {e}\n")
   return None
 
-def load_preprocess_and_extract(image_path: str):
+def segment_text_lines(image: Image.Image,
+                       ink_threshold=128,
+                       min_row_ink=0.002,
+                       min_line_height=8,
+                       max_line_gap=6,
+                       max_line_height=200,
+                       padding=6) -> list[tuple[int, int, int, int]]:
+  """
+  Segment a binarized page into text line regions using projection profiles.
+
+  Rows containing ink are grouped into lines, small gaps between rows are
+  merged, and each line is trimmed horizontally to its inked columns so that
+  blank margins are cropped away. Bands taller than max_line_height, where
+  ascenders and descenders of neighbouring lines touch, are split again at
+  the row with the least ink.
+
+  :param image: A binarized PIL Image as returned by preprocess_image (dark text on white).
+  :type image: Image.Image
+  :param ink_threshold: Pixel intensity below which a pixel is counted as ink.
+  :type ink_threshold: int
+  :param min_row_ink: Minimum fraction of inked pixels for a row to be part of a line.
+  :type min_row_ink: float
+  :param min_line_height: Minimum height in pixels for a region to be kept.
+  :type min_line_height: int
+  :param max_line_gap: Maximum number of blank rows to bridge inside a single line.
+  :type max_line_gap: int
+  :param max_line_height: Height in pixels above which a band is split at its faintest row.
+  :type max_line_height: int
+  :param padding: Number of pixels of padding to keep around each region.
+  :type padding: int
+  :return: A list of (left, top, right, bottom) boxes in reading order.
+  :rtype: list[tuple[int, int, int, int]]
+  """
+  ink = np.array(image.convert("L")) < ink_threshold
+  height, width = ink.shape
+  # horizontal projection profile: fraction of inked pixels per row
+  row_profile = ink.mean(axis=1)
+  rows = np.flatnonzero(row_profile >= min_row_ink)
+  if rows.size == 0:
+    return []
+
+  # group consecutive inked rows into lines, bridging small gaps
+  breaks = np.flatnonzero(np.diff(rows) > max_line_gap + 1)
+  starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+  ends = np.concatenate((rows[breaks], [rows[-1]]))
+
+  # split bands of touching lines at the faintest row, keeping reading order
+  bands = []
+  pending = list(zip(starts, ends))[::-1]
+  while pending:
+    top, bottom = pending.pop()
+    if bottom - top + 1 <= max_line_height:
+      bands.append((top, bottom))
+      continue
+    search_top, search_bottom = top + min_line_height, bottom - min_line_height
+    if search_bottom < search_top:
+      bands.append((top, bottom))
+      continue
+    split = search_top + int(np.argmin(row_profile[search_top:search_bottom + 1]))
+    pending.append((split, bottom))
+    pending.append((top, split - 1))
+
+  boxes = []
+  for top, bottom in bands:
+    if bottom - top + 1 < min_line_height:
+      continue
+    # vertical projection profile within the line to crop the margins
+    cols = np.flatnonzero(ink[top:bottom + 1].any(axis=0))
+    if cols.size == 0:
+      continue
+    boxes.append((
+      max(int(cols[0]) - padding, 0),
+      max(int(top) - padding, 0),
+      min(int(cols[-1]) + 1 + padding, width),
+      min(int(bottom) + 1 + padding, height)
+    ))
+  return boxes
+
+def crop_regions(image: Image.Image,
+                 boxes: list[tuple[int, int, int, int]],
+                 min_size=28) -> list[Image.Image]:
+  """
+  Crop the given regions out of an image, padding each crop with background
+  so it is at least the minimum size accepted by the Qwen-VL processor.
+
+  :param image: The binarized PIL Image to crop from.
+  :type image: Image.Image
+  :param boxes: A list of (left, top, right, bottom) boxes.
+  :type boxes: list[tuple[int, int, int, int]]
+  :param min_size: Minimum width and height of each crop in pixels.
+  :type min_size: int
+  :return: A list of cropped PIL Images in the same order as the boxes.
+  :rtype: list[Image.Image]
+  """
+  regions = []
+  for box in boxes:
+    region = image.crop(box)
+    if region.width < min_size or region.height < min_size:
+      padded = Image.new(region.mode, (max(region.width, min_size),
+                                       max(region.height, min_size)), 255)
+      padded.paste(region, (0, 0))
+      region = padded
+    regions.append(region)
+  return regions
+
+def extract_text_from_regions(regions: list[Image.Image],
+                              qwen_tokenizer: AutoProcessor,
+                              qwen_model: Qwen2_5_VLForConditionalGeneration,
+                              batch_size=8,
+                              line_height=100) -> str:
+  """
+  Perform batched OCR on cropped text regions using Qwen-VL and stitch the
+  transcriptions back together in reading order.
+
+  :param regions: A list of PIL Image regions in reading order.
+  :type regions: list[Image.Image]
+  :param qwen_tokenizer: An instance of the Qwen-VL processor.
+  :type qwen_tokenizer: AutoProcessor
+  :param qwen_model: An instance of the Qwen-VL model.
+  :type qwen_model: Qwen2_5_VLForConditionalGeneration
+  :param batch_size: Number of regions transcribed per forward pass.
+  :type batch_size: int
+  :param line_height: Approximate height of one line of handwriting in pixels, used to size the token budget.
+  :type line_height: int
+  :return: The extracted text of all regions joined line by line.
+  :rtype: str
+  """
+  try:
+    text_input = build_ocr_prompt(qwen_tokenizer)
+
+    lines = []
+    for i in range(0, len(regions), batch_size):
+      batch = regions[i:i + batch_size]
+      # 128 tokens per line of handwriting, capped at the whole-page budget
+      num_lines = -(-max(region.height for region in batch) // line_height)
+      inputs = (qwen_tokenizer(text=[text_input] * len(batch),
+                               images=batch,
+                               padding=True,
+                               return_tensors="pt")
+                              .to(qwen_model.device))
+      output = qwen_model.generate(**inputs, max_new_tokens=min(128 * num_lines, 512))
+      raw_texts = qwen_tokenizer.batch_decode(output, skip_special_tokens=True)
+      # Remove role headers if present
+      lines.extend(raw.split("assistant")[-1].strip() for raw in raw_texts)
+    return "\n".join(line for line in lines if line)
+  except Exception as e:
+    print(f"Error processing: {e}\n")
+  return None
+
+@lru_cache(maxsize=None)
+def _load_cached_qwen(provider: str) -> tuple:
+  return load_qwen()
+
+def get_qwen() -> tuple:
+  """
+  Get the Qwen-VL model and processor for the current model provider,
+  loading them only on the first call.
+
+  :return: A tuple containing the model and processor.
+  :rtype: tuple
+  """
+  return _load_cached_qwen(get_model_provider())
+
+def load_preprocess_and_extract(image_path: str, segment=True):
+  qwen_model, processor = get_qwen()
   preprocessed_image = preprocess_image(image_path)
+  if segment:
+    boxes = segment_text_lines(preprocessed_image)
+    if boxes:
+      regions = crop_regions(preprocessed_image, boxes)
+      text = extract_text_from_regions(regions, processor, qwen_model)
+      if text is not None:
+        return text
+  # fall back to the whole page if no text lines were found or region OCR failed
   return extract_text_from_image(preprocessed_image, processor, qwen_model)
-
-if __name__ != "__main__":
-  # Load Qwen model and processor once at module level
-  qwen_model, processor = load_qwen()
\ No newline at end of file
@@ -0,0 +1,116 @@
+import gc
+import os
+import warnings
+import multiprocessing
+
+import cv2
+import torch
+
+from emotion_module import get_emotion_model
+from keyword_module import get_nlp
+from main import run_psychextract
+from triage_module import triage_text, triage_stats
+from ocr_module import get_qwen
+
+def get_worker_layout(num_workers=None, threads_per_worker=1, cpu_count=None) -> tuple[int, int]:
+  """
+  Work out how many worker processes to start and how many torch intra-op
+  threads each of them may use without oversubscribing the CPU. An explicit
+  num_workers is clamped so that num_workers * threads_per_worker fits the CPU.
+
+  :param num_workers: Requested number of worker processes, or None to fill the machine.
+  :type num_workers: int
+  :param threads_per_worker: Number of torch intra-op threads per worker.
+  :type threads_per_worker: int
+  :param cpu_count: Number of available CPU cores, defaults to os.cpu_count().
+  :type cpu_count: int
+  :return: A tuple of (num_workers, threads_per_worker).
+  :rtype: tuple[int, int]
+  """
+  cpu_count = cpu_count or os.cpu_count() or 1
+  threads_per_worker = max(1, min(threads_per_worker, cpu_count))
+  max_workers = cpu_count // threads_per_worker
+  if num_workers is None or num_workers > max_workers:
+    num_workers = max_workers
+  return max(1, num_workers), threads_per_worker
+
+def warm_up_models(share_memory=False) -> None:
+  """
+  Load every model once in the parent process so forked workers inherit them.
+
+  Weights are only read during inference, so forked workers share the parent's
+  pages copy-on-write. Freezing the garbage collector keeps the collector from
+  touching the inherited objects and copying their pages into every worker.
+
+  :param share_memory: Also move the torch weights into shared memory.
+  :type share_memory: bool
+  """
+  emotion_model, _ = get_emotion_model()
+  get_nlp()
+  qwen_model, _ = get_qwen()
+  qwen_model.eval()
+  if share_memory:
+    emotion_model.share_memory()
+    qwen_model.share_memory()
+  gc.collect()
+  gc.freeze()
+
+def _init_worker(threads_per_worker: int) -> None:
+  # pin torch and OpenCV threads so workers don't compete for the same cores
+  torch.set_num_threads(threads_per_worker)
+  cv2.setNumThreads(threads_per_worker)
+  try:
+    torch.set_num_interop_threads(1)
+  except RuntimeError:
+    # the inter-op pool can only be configured before it is first used
+    pass
+
+def _run_document(job: tuple[str, str]) -> tuple:
+  image_path, output_path = job
+  return run_psychextract(image_path, output_path)
+
+def run_psychextract_pool(jobs: list[tuple[str, str]],
+                          num_workers=None,
+                          threads_per_worker=1,
+                          share_memory=False) -> list[tuple]:
+  """
+  Run the PsychExtract pipeline over many documents with a pool of forked workers.
+
+  Models are loaded once in the calling process and shared read-only with the
+  workers. Intended for CPU inference, since CUDA cannot be used after a fork.
+  Where the fork start method is unavailable (e.g. Windows) the documents are
+  processed serially in the calling process instead.
+
+  :param jobs: A list of (image_path, output_path) pairs, one per document.
+  :type jobs: list[tuple[str, str]]
+  :param num_workers: Number of worker processes, or None to fill the machine.
+  :type num_workers: int
+  :param threads_per_worker: Number of torch intra-op threads per worker.
+  :type threads_per_worker: int
+  :param share_memory: Also move the torch weights into shared memory.
+  :type share_memory: bool
+  :return: The pipeline results, in the same order as the jobs.
+  :rtype: list[tuple]
+  """
+  if "fork" not in multiprocessing.get_all_start_methods():
+    warnings.warn("The fork start method is not available on this platform, "
+                  "so run_psychextract_pool is processing the documents serially.")
+    return [run_psychextract(image_path, output_path) for image_path, output_path in jobs]
+
+  num_workers, threads_per_worker = get_worker_layout(num_workers, threads_per_worker)
+  warm_up_models(share_memory)
+  # fast tokenizers warn in every forked worker once their own thread pool has been used
+  os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+  ctx = multiprocessing.get_context("fork")
+  try:
+    with ctx.Pool(num_workers,
+                  initializer=_init_worker,
+                  initargs=(threads_per_worker,)) as pool:
+      # documents are heavy, so hand them out one at a time
+      results = list(pool.imap(_run_document, jobs, chunksize=1))
+  finally:
+    gc.unfreeze()
+  # workers record triage decisions in their own memory, so record them here too
+  for result in results:
+    triage_stats.record(triage_text(result[0]))
+  return results
@@ -0,0 +1,59 @@
+import os
+
+PROVIDER_ENV_VAR = "PSYCHEXTRACT_MODEL_PROVIDER"
+PROVIDERS = ("hub", "offline")
+
+def normalize_model_provider(provider: str) -> str:
+  """
+  Normalize a provider name and check that it is known, so a typo never
+  silently falls back to downloading the Hub checkpoints.
+
+  :param provider: The provider name, in any casing.
+  :type provider: str
+  :return: The lowercased provider name.
+  :rtype: str
+  :raises ValueError: If the provider is not one of PROVIDERS.
+  """
+  normalized = provider.strip().lower()
+  if normalized not in PROVIDERS:
+    raise ValueError(f"Unknown model provider {provider!r}, expected one of {PROVIDERS}")
+  return normalized
+
+def get_model_provider() -> str:
+  """
+  Get the name of the model provider the loaders should use.
+
+  "hub" loads the real checkpoints from the Hugging Face Hub and spaCy,
+  "offline" builds tiny randomly initialized stand-ins that need no downloads.
+
+  :return: The provider name, read from the PSYCHEXTRACT_MODEL_PROVIDER environment variable.
+  :rtype: str
+  :raises ValueError: If the environment variable names an unknown provider.
+  """
+  return normalize_model_provider(os.environ.get(PROVIDER_ENV_VAR, "hub"))
+
+def set_model_provider(provider: str) -> None:
+  """
+  Set the model provider for this process and any workers it starts.
+
+  :param provider: Either "hub" or "offline".
+  :type provider: str
+  :raises ValueError: If the provider is not one of PROVIDERS.
+  """
+  os.environ[PROVIDER_ENV_VAR] = normalize_model_provider(provider)
+
+def get_offline_vocab() -> list[str]:
+  """
+  Provides the small word list shared by the offline OCR and emotion stand-ins.
+
+  :return: A list of words, starting with the special tokens.
+  :rtype: list[str]
+  """
+  return [
+    "<s>", "<pad>", "</s>", "<unk>", "assistant",
+    "i", "noticed", "felt", "tense", "body", "morning", "shoulders",
+    "tight", "breathing", "work", "family", "stress", "writing", "calm",
+    "tired", "sleep", "friend", "day", "heavy", "worried", "hope",
+    "walk", "rain", "conversation", "head", "home", "quiet", "restless",
+    "evening", "letter", "garden", "music", "kitchen", "weekend", "sister"
+  ]
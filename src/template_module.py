@@ -1,5 +1,12 @@
 import numpy as np
-import random
+import re
+import json
+import hashlib
+from pathlib import Path
+from types import MappingProxyType
+from functools import lru_cache
+
+DEFAULT_TEMPLATE_CONFIG = str(Path(__file__).parent / "template_config.json")
 
 def format_list_into_string(words: list[str]) -> str:
   """
@@ -18,59 +25,38 @@ def format_list_into_string(words: list[str]) -> str:
     return " and ".join(words)
   return ", ".join(words[:-1]) + ", and " + words[-1]
 
-# lightweight linguistic detectors
-def get_uncertainty_phrases() -> list[str]:
-  """
-  Provides a list of phrases that indicate 
-  uncertainty or difficulty in articulating feelings.
-  
-  :return: A list of phrases commonly used to express 
-  uncertainty or difficulty in explaining emotions.
-  :rtype: list[str]
-  """
-  return [
-  "not sure", "hard to name", "can't explain", "cannot explain",
-  "something is there", "difficult to explain"
-  ]
-def get_coping_verbs() -> list[str]:
-  """
-  Provides a list of verbs that indicate 
-  coping strategies or actions taken to manage emotions.
-  
-  :return: A list of verbs commonly associated with 
-  coping strategies or emotional management.
-  :rtype: list[str]
-  """
-  return [
-  "writing", "reflecting", "reflection", "breathing",
-  "grounding", "sitting with", "slowing"
-  ]
-def get_somatic_terms() -> list[str]:
-  """
-  Provides a list of somatic terms that may indicate 
-  physical sensations associated with emotions.
-  
-  :return: A list of somatic terms that could be used to 
-  identify physical sensations related to emotional experiences.
-  :rtype: list[str]
+@lru_cache(maxsize=None)
+def load_template_config(config_path=DEFAULT_TEMPLATE_CONFIG) -> dict:
   """
-  return [
-  "body", "shoulders", "breathing", "tight",
-  "tense", "restless", "tension"
-  ]
-def get_self_reflective_phrases() -> list[str]:
-  """
-  Provides a list of self-reflective phrases that may indicate 
-  introspection or self-awareness in the text.
-  
-  :return: A list of self-reflective phrases that could be used to identify 
-  moments of introspection or self-awareness in the text.
-  :rtype: list[str]
-  """  
-  return [
-  "i noticed", "i realized", "i caught myself",
-  "pattern in my reactions", "i keep noticing"
-  ]
+  Loads the template and lexicon sets from a JSON config file and precompiles them.
+
+  The config is read once per path and shared by all callers, so it is returned as read-only mappings of tuples.
+
+  :param config_path: Path to the JSON config file with "lexicons" and "templates" sections.
+  :type config_path: str
+  :return: A dictionary with the raw "lexicons" and "templates", the compiled "lexicon_patterns" (None for an empty lexicon) and the "compiled_templates" split around their theme placeholder.
+  :rtype: MappingProxyType
+  """
+  with open(config_path, encoding="utf-8") as f:
+    config = json.load(f)
+  lexicons = {name: tuple(phrases) for name, phrases in config["lexicons"].items()}
+  templates = {cat: tuple(variants) for cat, variants in config["templates"].items()}
+  return MappingProxyType({
+    "lexicons": MappingProxyType(lexicons),
+    "templates": MappingProxyType(templates),
+    # one alternation per lexicon, matched against lowercased text;
+    # an empty alternation would match everything, so empty lexicons get no pattern
+    "lexicon_patterns": MappingProxyType({
+      name: re.compile("|".join(re.escape(p) for p in phrases)) if phrases else None
+      for name, phrases in lexicons.items()
+    }),
+    # template text around each {theme} placeholder, joined with the theme at render time
+    "compiled_templates": MappingProxyType({
+      cat: tuple(tuple(variant.split("{theme}")) for variant in variants)
+      for cat, variants in templates.items()
+    })
+  })
+
 def get_templates() -> dict[str, str]:
   """
   Provides a dictionary of templates for generating insights based on detected themes.
@@ -78,59 +64,26 @@ def get_templates() -> dict[str, str]:
   :return: A dictionary where keys are insight categories and values are lists of template sentences that can be filled in with specific themes or keywords to generate personalized insights.
   :rtype: dict[str, str]
   """ 
-  return {
-    "Emotional Load": [
-      "This entry suggests a relatively high emotional load, particularly in relation to {theme}.",
-      "The overall tone of this entry indicates emotional heaviness connected to {theme}."
-    ],
-    "Emotional Clarity against Ambiguity": [
-      "The feelings described here appear difficult to clearly define, especially around {theme}.",
-      "This entry reflects some uncertainty or ambiguity in how emotions related to {theme} are understood."
-    ],
-    "Regulation and Coping Mode": [
-      "This entry highlights an active attempt to regulate emotions through reflection, particularly in response to {theme}.",
-      "The writer appears to be engaging in a coping process while thinking about {theme}."
-    ],
-    "Arousal or Restlessness Level": [
-      "The language used suggests heightened internal activation or restlessness related to {theme}.",
-      "This entry reflects a state of tension or agitation associated with {theme}."
-    ],
-    "Self-Relation and Appraisal": [
-      "This entry shows reflective self-evaluation in relation to {theme}.",
-      "The writer appears to be assessing their own reactions or patterns while considering {theme}."
-    ]
-  }
-
-
-def contains_any(text: str, phrase_list: list[str]) -> bool:
-  """
-  Checks if any of the phrases in the list are present in the text.
-  
-  :param text: The text to analyze for the presence of phrases.
-  :type text: str
-  :param phrase_list: A list of phrases to check for in the text.
-  :type phrase_list: list[str]
-  :return: True if any of the phrases from the list are found in the text, False otherwise.
-  :rtype: bool
-  """
-  text = text.lower()
-  return any(p in text for p in phrase_list)
+  return {cat: list(variants) for cat, variants in load_template_config()["templates"].items()}
+
 
-def count_any(text: str, phrase_list: list[str]) -> int:
+def matches_lexicon(text: str, lexicon: str, config=None) -> bool:
   """
-  Counts how many phrases from the list are present in the text.
+  Checks if any phrase of a configured lexicon is present in the text.
   
-  :param text: The text to analyze for the presence of phrases.
+  :param text: The lowercased text to analyze for the presence of phrases.
   :type text: str
-  :param phrase_list: A list of phrases to check for in the text.
-  :type phrase_list: list[str]
-  :return: The count of how many phrases from the list are found in the text.
-  :rtype: int
+  :param lexicon: The name of the lexicon in the config, e.g. "coping_verbs".
+  :type lexicon: str
+  :param config: A config returned by load_template_config, defaults to the bundled config.
+  :type config: dict
+  :return: True if any phrase of the lexicon is found in the text, False otherwise or if the lexicon is empty.
+  :rtype: bool
   """
-  text = text.lower()
-  return sum(p in text for p in phrase_list)
+  pattern = (config or load_template_config())["lexicon_patterns"][lexicon]
+  return pattern is not None and pattern.search(text) is not None
 
-def detect_insights(text: str, emotions: dict[str, float]) -> list[str]:
+def detect_insights(text: str, emotions: dict[str, float], config=None) -> list[str]:
   """
   Detects psychological insights based on the predicted emotions and the content of the text.
   
@@ -138,33 +91,50 @@ def detect_insights(text: str, emotions: dict[str, float]) -> list[str]:
   :type emotions: dict[str, float]
   :param text: The original text extracted from the image, used for linguistic analysis to detect insights.
   :type text: str
+  :param config: A config returned by load_template_config, defaults to the bundled config.
+  :type config: dict
   :return: A list of detected insights based on the emotional profile and linguistic cues in the text.
   :rtype: list[str]
   """
+  config = config or load_template_config()
+  text = text.lower()
   insights = []
   # Emotional Load
   mean_neg = np.mean(emotions["sadness"] + emotions["fear"] + emotions['pessimism'])
   if mean_neg > 0.6:
     insights.append("Emotional Load")
   # Emotional Clarity vs Ambiguity
-  uncertainty_phrases = get_uncertainty_phrases()
-  if count_any(text, uncertainty_phrases) >= 1:
+  if matches_lexicon(text, "uncertainty_phrases", config):
     insights.append("Emotional Clarity against Ambiguity")
   # Regulation & Coping
-  coping_verbs = get_coping_verbs()
-  if contains_any(text, coping_verbs):
+  if matches_lexicon(text, "coping_verbs", config):
     insights.append("Regulation and Coping Mode")
   # Arousal / Restlessness
-  somatic_terms = get_somatic_terms()
   if (emotions["fear"] + emotions["anger"] > 0.6 or
-      contains_any(text, somatic_terms)):
+      matches_lexicon(text, "somatic_terms", config)):
     insights.append("Arousal or Restlessness Level")
   # Self-Relation & Appraisal
-  self_reflective_phrases = get_self_reflective_phrases()
-  if contains_any(text, self_reflective_phrases):
+  if matches_lexicon(text, "self_reflective_phrases", config):
     insights.append("Self-Relation and Appraisal")
   return insights
 
+def choose_template_variant(text: str, category: str, num_variants: int) -> int:
+  """
+  Chooses a template variant from a stable hash of the document and category,
+  so the same entry always gets the same wording without using global random state.
+  
+  :param text: The original text extracted from the image.
+  :type text: str
+  :param category: The insight category the template is chosen for.
+  :type category: str
+  :param num_variants: The number of template variants available for the category.
+  :type num_variants: int
+  :return: The index of the chosen template variant.
+  :rtype: int
+  """
+  digest = hashlib.blake2b(f"{category}\0{text}".encode("utf-8"), digest_size=8).digest()
+  return int.from_bytes(digest, "big") % num_variants
+
 def format_insight_sentences(emotions: dict, insights: list[dict]) -> str:
   """
   Formats the detected insights and predicted emotions into coherent sentences based on predefined templates.
@@ -193,37 +163,64 @@ def format_insight_sentences(emotions: dict, insights: list[dict]) -> str:
   # Combine everything
   return emotion_themes + insight_themes + texts
 
-def generate_insight_sentences(text: str, emotions: dict[str, float], keywords: list) -> str:
+def generate_insight_sentences(text: str, emotions: dict[str, float], keywords: list, config=None) -> str:
   """
   Generates personalized insight sentences based on the detected insights, predicted emotions, and identified themes in the text.
 
   :param text: The original text extracted from the image, used for linguistic analysis to generate insights.
   :type text: str
-  :param emotions: A dictionary of predicted emotions with their corresponding intensity scores, used to determine which insights are relevant. :type emotions: dict[str, float] :param keywords: A list of keywords representing themes in the text, used to personalize the insight sentences. :type keywords: list :return: A list of dictionaries, each containing an insight category and a generated sentence that provides a personalized interpretation of the emotional content related to the detected themes. :rtype: list[dict[str, str]]
+  :param emotions: A dictionary of predicted emotions with their corresponding intensity scores, used to determine which insights are relevant.
   :type emotions: dict[str, float]
   :param  keywords: A list of keywords representing themes in the text, used to personalize the insight sentences.
   :type keywords: list[str]
+  :param config: A config returned by load_template_config, defaults to the bundled config.
+  :type config: dict
   :return: A formatted string that combines the detected insight categories and the generated sentences based on the templates, providing a personalized interpretation of the emotional content related to the detected themes.
   :rtype: str
   """
-  random.seed(42)
+  return generate_insight_sentences_batch([text], [emotions], [keywords], config)[0]
 
-  keywords_text = "their " + format_list_into_string(keywords)
-  categories = detect_insights(text, emotions)
-  templates = get_templates()
-  outputs = []
-  
-  if not categories:
-    outputs.append({
-      "category": "",
-      "text": ""
-    })
+def generate_insight_sentences_batch(texts: list[str],
+                                     emotions_list: list[dict[str, float]],
+                                     keywords_list: list[list],
+                                     config=None) -> list[str]:
+  """
+  Generates insight sentences for a batch of documents with a shared precompiled config.
+  Template variants are chosen per document, so the output is reproducible and safe to call from multiple threads.
 
-  for cat in categories:
-    template = random.choice(templates[cat])
-    outputs.append({
-      "category": cat,
-      "text": template.format(theme=keywords_text)
-    })
+  :param texts: The original texts extracted from the images.
+  :type texts: list[str]
+  :param emotions_list: The predicted emotions of each document.
+  :type emotions_list: list[dict[str, float]]
+  :param keywords_list: The keywords representing themes in each document.
+  :type keywords_list: list[list]
+  :param config: A config returned by load_template_config, defaults to the bundled config.
+  :type config: dict
+  :return: One formatted insight string per document, in the same order as the inputs.
+  :rtype: list[str]
+  """
+  config = config or load_template_config()
+  templates = config["compiled_templates"]
+  results = []
+
+  for text, emotions, keywords in zip(texts, emotions_list, keywords_list):
+    keywords_text = "their " + format_list_into_string(keywords)
+    categories = detect_insights(text, emotions, config)
+    outputs = []
+
+    if not categories:
+      outputs.append({
+        "category": "",
+        "text": ""
+      })
+
+    for cat in categories:
+      variants = templates[cat]
+      template = variants[choose_template_variant(text, cat, len(variants))]
+      outputs.append({
+        "category": cat,
+        "text": keywords_text.join(template)
+      })
 
-  return format_insight_sentences(emotions, outputs)
\ No newline at end of file
+    results.append(format_insight_sentences(emotions, outputs))
+  return results
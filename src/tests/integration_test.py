@@ -1,11 +1,14 @@
 import unittest
+from pathlib import Path
 from main import run_psychextract
 
+EXAMPLE_IO = Path(__file__).parent.parent / "example_io"
+
 class TestIntegration(unittest.TestCase):
   @classmethod
   def setUpClass(cls):
     # Run the full pipeline once for all tests
-    cls.result = run_psychextract("example_io\\text1_a.png", "example_io\\output.wav")
+    cls.result = run_psychextract(str(EXAMPLE_IO / "text1_a.png"), str(EXAMPLE_IO / "output.wav"))
 
   def test_ocr(self):
     ocr_detected_text = self.result[0]
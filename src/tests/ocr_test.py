@@ -1,17 +1,53 @@
 import unittest
-from ocr_module import preprocess_image, load_qwen, extract_text_from_image
+from ocr_module import (
+  preprocess_image,
+  load_qwen,
+  extract_text_from_image,
+  segment_text_lines,
+  crop_regions
+  )
 
+import numpy as np
+from pathlib import Path
 from PIL import Image
 
+EXAMPLE_IMAGE = str(Path(__file__).parent.parent / "example_io" / "text1_a.png")
+
 class TestOCRModule(unittest.TestCase):
   def test_preprocess_image(self):
     # Test that the preprocess_image function runs without errors
     try:
-      img = preprocess_image("C:\\Users\\carli\\OneDrive\\UoL\\FP\\Deliverables\\PsychExtract\\data\\OCR\\raw_handwritten\\text0_a.png")
+      img = preprocess_image(EXAMPLE_IMAGE)
       self.assertIsInstance(img, Image.Image)
     except Exception as e:
       self.fail(f'preprocess_image raised an exception: {e}')
 
+  def test_segment_text_lines(self):
+    # Two dark text bands on a white page, with wide empty margins
+    page = np.full((200, 300), 255, dtype=np.uint8)
+    page[40:60, 50:250] = 0
+    page[120:140, 80:200] = 0
+    boxes = segment_text_lines(Image.fromarray(page), padding=0)
+    self.assertEqual(boxes, [(50, 40, 250, 60), (80, 120, 200, 140)])
+
+  def test_segment_text_lines_touching_lines(self):
+    # Two lines joined by a few descender strokes are split at the faintest rows
+    page = np.full((250, 300), 255, dtype=np.uint8)
+    page[40:90, 50:250] = 0
+    page[90:110, 100:105] = 0
+    page[110:160, 50:250] = 0
+    boxes = segment_text_lines(Image.fromarray(page), max_line_height=100, padding=0)
+    self.assertEqual(boxes, [(50, 40, 250, 90), (50, 90, 250, 160)])
+
+  def test_segment_text_lines_blank_page(self):
+    page = np.full((100, 100), 255, dtype=np.uint8)
+    self.assertEqual(segment_text_lines(Image.fromarray(page)), [])
+
+  def test_crop_regions_min_size(self):
+    page = Image.fromarray(np.full((100, 100), 255, dtype=np.uint8))
+    regions = crop_regions(page, [(10, 10, 60, 20)])
+    self.assertEqual(regions[0].size, (50, 28))
+
   def test_load_qwen_model(self):
     # Test that the Qwen model loads without errors
     try:
@@ -21,7 +57,7 @@ class TestOCRModule(unittest.TestCase):
 
   def test_extract_text_from_image(self):
     # Test that the extract_text_from_image function returns the expected string
-    img = preprocess_image("C:\\Users\\carli\\OneDrive\\UoL\\FP\\Deliverables\\PsychExtract\\data\\OCR\\raw_handwritten\\text0_a.png")
+    img = preprocess_image(EXAMPLE_IMAGE)
     print('preprocessed image')
     qwen_model, processor = load_qwen()
     print('loaded model and processor')
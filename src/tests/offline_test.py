@@ -0,0 +1,90 @@
+import os
+import tempfile
+import multiprocessing
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+from provider_module import PROVIDER_ENV_VAR, set_model_provider, get_model_provider
+from fixture_module import generate_handwriting_fixture, generate_fixture_set
+from main import run_psychextract
+from pool_module import run_psychextract_pool
+from benchmark import run_benchmark, count_vision_patches
+
+HAS_FORK = "fork" in multiprocessing.get_all_start_methods()
+
+class TestOfflinePipeline(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    # Run the full pipeline with the offline stand-ins, restoring the provider afterwards
+    cls.previous_provider = os.environ.get(PROVIDER_ENV_VAR)
+    set_model_provider("offline")
+    cls.tmp_dir = tempfile.TemporaryDirectory()
+    cls.image_paths = generate_fixture_set(cls.tmp_dir.name, num_pages=3)
+    cls.jobs = [(path, str(Path(cls.tmp_dir.name) / f"output_{i}.wav"))
+                for i, path in enumerate(cls.image_paths)]
+    cls.result = run_psychextract(*cls.jobs[0])
+
+  @classmethod
+  def tearDownClass(cls):
+    cls.tmp_dir.cleanup()
+    if cls.previous_provider is None:
+      os.environ.pop(PROVIDER_ENV_VAR, None)
+    else:
+      os.environ[PROVIDER_ENV_VAR] = cls.previous_provider
+
+  def test_set_model_provider(self):
+    self.assertEqual(get_model_provider(), "offline")
+    with self.assertRaises(ValueError):
+      set_model_provider("cloud")
+
+  def test_get_model_provider_normalizes_and_validates(self):
+    with patch.dict(os.environ, {PROVIDER_ENV_VAR: " Offline "}):
+      self.assertEqual(get_model_provider(), "offline")
+    with patch.dict(os.environ, {PROVIDER_ENV_VAR: "offine"}):
+      with self.assertRaises(ValueError):
+        get_model_provider()
+
+  @unittest.skipUnless(HAS_FORK, "the worker pool needs the fork start method")
+  def test_run_benchmark(self):
+    result = run_benchmark(num_docs=3, num_workers=2)
+    self.assertEqual(result["serial_triage"]["total"], 3)
+    self.assertEqual(result["pool_triage"]["total"], 3)
+    self.assertGreater(result["pool_docs_per_second"], 0)
+    self.assertGreater(result["ocr_segmented_docs_per_second"], 0)
+    self.assertLess(result["ocr_segmented_patches"], result["ocr_whole_page_patches"])
+
+  def test_count_vision_patches(self):
+    # cropping the blank margins leaves fewer patches for the OCR model
+    path = self.image_paths[0]
+    self.assertLess(count_vision_patches(path, segment=True), count_vision_patches(path, segment=False))
+
+  def test_generate_handwriting_fixture(self):
+    img = generate_handwriting_fixture("I noticed how tense my body felt.", seed=1)
+    self.assertIsInstance(img, Image.Image)
+    self.assertEqual(img.tobytes(), generate_handwriting_fixture("I noticed how tense my body felt.", seed=1).tobytes())
+
+  def test_pipeline(self):
+    text, emotions, keywords, insight_sentences, tts_res = self.result
+    self.assertIsInstance(text, str)
+    self.assertGreater(len(text), 0)
+    self.assertIn("joy", emotions)
+    self.assertIsInstance(emotions["joy"], float)
+    self.assertIsInstance(keywords, list)
+    self.assertIsInstance(insight_sentences, str)
+    self.assertIsNotNone(tts_res)
+    self.assertTrue(Path(self.jobs[0][1]).exists())
+
+  def test_blank_page_is_triaged(self):
+    text, emotions, keywords, insight_sentences, tts_res = run_psychextract(*self.jobs[-1])
+    self.assertEqual(text, "")
+    self.assertEqual(keywords, [])
+    self.assertIsNone(tts_res)
+
+  @unittest.skipUnless(HAS_FORK, "the worker pool needs the fork start method")
+  def test_pool(self):
+    results = run_psychextract_pool(self.jobs, num_workers=2)
+    self.assertEqual(len(results), len(self.jobs))
+    self.assertEqual(results[0][0], self.result[0])
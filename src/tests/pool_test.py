@@ -0,0 +1,57 @@
+import multiprocessing
+import unittest
+from unittest.mock import MagicMock, patch
+
+import torch
+
+import pool_module
+from pool_module import get_worker_layout, run_psychextract_pool
+from triage_module import TriageStats
+
+def fake_run_psychextract(image_path, output_path):
+  # report the thread count each worker was pinned to
+  return image_path, output_path, torch.get_num_threads()
+
+class TestPoolModule(unittest.TestCase):
+  def test_get_worker_layout_fills_machine(self):
+    self.assertEqual(get_worker_layout(cpu_count=64), (64, 1))
+    self.assertEqual(get_worker_layout(threads_per_worker=4, cpu_count=64), (16, 4))
+
+  def test_get_worker_layout_explicit_workers(self):
+    self.assertEqual(get_worker_layout(num_workers=8, threads_per_worker=2, cpu_count=64), (8, 2))
+
+  def test_get_worker_layout_clamps_workers(self):
+    self.assertEqual(get_worker_layout(num_workers=100, cpu_count=64), (64, 1))
+    self.assertEqual(get_worker_layout(num_workers=40, threads_per_worker=2, cpu_count=64), (32, 2))
+
+  def test_get_worker_layout_clamps_threads(self):
+    self.assertEqual(get_worker_layout(threads_per_worker=128, cpu_count=64), (1, 64))
+    self.assertEqual(get_worker_layout(threads_per_worker=0, cpu_count=4), (4, 1))
+
+  @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(),
+                       "the worker pool needs the fork start method")
+  def test_run_psychextract_pool(self):
+    # stub the models so the pool can be exercised without loading any checkpoints
+    emotion_model, qwen_model = MagicMock(), MagicMock()
+    jobs = [(f"page_{i}.png", f"page_{i}.wav") for i in range(6)]
+    with patch.object(pool_module, "get_emotion_model", return_value=(emotion_model, None)), \
+         patch.object(pool_module, "get_qwen", return_value=(qwen_model, None)), \
+         patch.object(pool_module, "get_nlp") as get_nlp, \
+         patch.object(pool_module, "run_psychextract", fake_run_psychextract), \
+         patch.object(pool_module, "triage_stats", TriageStats()) as stats:
+      results = run_psychextract_pool(jobs, num_workers=2, threads_per_worker=1, share_memory=True)
+    self.assertEqual(stats.summary()["total"], len(jobs))
+    get_nlp.assert_called_once()
+    qwen_model.eval.assert_called_once()
+    emotion_model.share_memory.assert_called_once()
+    qwen_model.share_memory.assert_called_once()
+    self.assertEqual([result[:2] for result in results], jobs)
+    self.assertTrue(all(result[2] == 1 for result in results))
+
+  def test_run_psychextract_pool_without_fork(self):
+    jobs = [(f"page_{i}.png", f"page_{i}.wav") for i in range(3)]
+    with patch.object(pool_module.multiprocessing, "get_all_start_methods", return_value=["spawn"]), \
+         patch.object(pool_module, "run_psychextract", fake_run_psychextract):
+      with self.assertWarns(UserWarning):
+        results = run_psychextract_pool(jobs, num_workers=2)
+    self.assertEqual([result[:2] for result in results], jobs)
@@ -1,9 +1,17 @@
+import json
+import tempfile
 import unittest
+from pathlib import Path
 from template_module import (
     format_list_into_string, 
     detect_insights, 
     format_insight_sentences,
-    generate_insight_sentences
+    generate_insight_sentences,
+    generate_insight_sentences_batch,
+    choose_template_variant,
+    load_template_config,
+    get_templates,
+    DEFAULT_TEMPLATE_CONFIG
   )
 
 class TestTemplateModule(unittest.TestCase):
@@ -36,3 +44,42 @@ class TestTemplateModule(unittest.TestCase):
     outputs = generate_insight_sentences(text, emotions, keywords) 
     self.assertIsInstance(outputs, str)
 
+  def test_load_template_config(self):
+    config = load_template_config()
+    self.assertIs(config, load_template_config())
+    self.assertEqual(set(config["compiled_templates"]), set(get_templates()))
+    self.assertTrue(config["lexicon_patterns"]["coping_verbs"].search("slowing down"))
+    with self.assertRaises(TypeError):
+      config["templates"]["Emotional Load"] = ("Overridden {theme}.",)
+    with self.assertRaises(TypeError):
+      config["lexicons"] = {}
+
+  def test_choose_template_variant(self):
+    text = "I noticed how tense my body felt this morning."
+    index = choose_template_variant(text, "Emotional Load", 2)
+    self.assertIn(index, (0, 1))
+    self.assertEqual(index, choose_template_variant(text, "Emotional Load", 2))
+
+  def test_generate_insight_sentences_batch(self):
+    texts = ["I feel so sad and scared.", "I noticed my shoulders were tight while writing."]
+    emotions = { "sadness": 0.8, "fear": 0.7, "pessimism": 0.5, "joy": 0.1, "anger": 0.2 }
+    keywords = ["family", "stress", "work"]
+    outputs = generate_insight_sentences_batch(texts, [emotions, emotions], [keywords, keywords])
+    self.assertEqual(len(outputs), 2)
+    for text, output in zip(texts, outputs):
+      self.assertEqual(output, generate_insight_sentences(text, emotions, keywords))
+      self.assertIn("their family, stress, and work", output)
+
+  def test_detect_insights_empty_lexicon(self):
+    with open(DEFAULT_TEMPLATE_CONFIG, encoding="utf-8") as f:
+      raw = json.load(f)
+    raw["lexicons"]["coping_verbs"] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = str(Path(tmp_dir) / "template_config.json")
+      with open(path, "w", encoding="utf-8") as f:
+        json.dump(raw, f)
+      config = load_template_config(path)
+    self.assertIsNone(config["lexicon_patterns"]["coping_verbs"])
+    emotions = { "sadness": 0.1, "fear": 0.1, "pessimism": 0.1, "joy": 0.1, "anger": 0.1 }
+    self.assertEqual(detect_insights("nothing relevant", emotions, config), [])
+    self.assertEqual(detect_insights("writing helps", emotions, config), [])
@@ -0,0 +1,51 @@
+import threading
+import unittest
+from triage_module import triage_text, get_default_result, TriageStats
+
+class TestTriageModule(unittest.TestCase):
+  def test_triage_text_empty(self):
+    self.assertEqual(triage_text(None), "empty")
+    self.assertEqual(triage_text(""), "empty")
+    self.assertEqual(triage_text("  \n "), "empty")
+
+  def test_triage_text_too_short(self):
+    self.assertEqual(triage_text("Tired today"), "too_short")
+
+  def test_triage_text_non_text(self):
+    self.assertEqual(triage_text("~~ |/ 0 # -- ;;"), "non_text")
+    self.assertEqual(triage_text("There is no text in this image."), "non_text")
+
+  def test_triage_text_analysed(self):
+    text = "I noticed how tense my body felt this morning."
+    self.assertIsNone(triage_text(text))
+
+  def test_get_default_result(self):
+    text, emotions, keywords, insight_sentences, tts_res = get_default_result(None, "empty")
+    self.assertEqual(text, "")
+    self.assertIn("joy", emotions)
+    self.assertEqual(emotions["joy"], 0.0)
+    self.assertEqual(keywords, [])
+    self.assertIsInstance(insight_sentences, str)
+    self.assertIsNone(tts_res)
+
+  def test_triage_stats(self):
+    stats = TriageStats()
+    for reason in [None, None, "empty", "too_short"]:
+      stats.record(reason)
+    summary = stats.summary()
+    self.assertEqual(summary["total"], 4)
+    self.assertEqual(summary["skipped"], 2)
+    self.assertEqual(summary["skip_rate"], 0.5)
+    self.assertEqual(summary["reasons"], {"empty": 1, "too_short": 1})
+
+  def test_triage_stats_concurrent_record(self):
+    stats = TriageStats()
+    def record_many():
+      for _ in range(1000):
+        stats.record("empty")
+    threads = [threading.Thread(target=record_many) for _ in range(8)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    self.assertEqual(stats.summary()["reasons"], {"empty": 8000})
@@ -0,0 +1,105 @@
+import threading
+from collections import Counter
+
+from emotion_module import get_labels
+
+def get_non_text_phrases() -> list[str]:
+  """
+  Provides a list of openings the OCR model answers with when a page has no readable text.
+
+  :return: A list of lowercase phrases that indicate a non-text transcription when they start the text.
+  :rtype: list[str]
+  """
+  return [
+    "no handwritten text", "no readable text", "there is no text",
+    "there is no handwritten text", "the image is blank",
+    "the image does not contain", "unable to transcribe"
+  ]
+
+def triage_text(text: str, min_words=3, min_alpha_ratio=0.5) -> str:
+  """
+  Decide whether an OCR transcription is worth running the heavy models on.
+
+  :param text: The text extracted from the image, or None if OCR failed.
+  :type text: str
+  :param min_words: Minimum number of words for a transcription to be analysed.
+  :type min_words: int
+  :param min_alpha_ratio: Minimum fraction of non-space characters that must be letters.
+  :type min_alpha_ratio: float
+  :return: The reason for skipping ("empty", "too_short" or "non_text"), or None if the text should be analysed.
+  :rtype: str
+  """
+  if not isinstance(text, str) or not text.strip():
+    return "empty"
+  chars = [c for c in text if not c.isspace()]
+  if sum(c.isalpha() for c in chars) / len(chars) < min_alpha_ratio:
+    return "non_text"
+  if text.strip().lower().startswith(tuple(get_non_text_phrases())):
+    return "non_text"
+  if len(text.split()) < min_words:
+    return "too_short"
+  return None
+
+def get_default_result(text: str, reason: str) -> tuple:
+  """
+  Build the cheap default pipeline result for a transcription that was skipped.
+
+  :param text: The text extracted from the image, or None if OCR failed.
+  :type text: str
+  :param reason: The reason returned by triage_text.
+  :type reason: str
+  :return: A tuple of (text, emotions, keywords, insight_sentences, tts_res) matching run_psychextract, with no TTS output.
+  :rtype: tuple
+  """
+  emotions = {label: 0.0 for label in get_labels()}
+  if reason == "too_short":
+    insight_sentences = "This entry is too short to analyse. Try writing a few more sentences."
+  else:
+    insight_sentences = "No readable handwriting was detected in this entry."
+  return text or "", emotions, [], insight_sentences, None
+
+class TriageStats:
+  """
+  Counts how many documents the triage stage analysed or skipped, and why.
+  Safe to share between threads.
+  """
+  def __init__(self):
+    self.counts = Counter()
+    self.lock = threading.Lock()
+
+  def record(self, reason: str) -> None:
+    with self.lock:
+      self.counts[reason or "analysed"] += 1
+
+  def reset(self) -> None:
+    with self.lock:
+      self.counts.clear()
+
+  def summary(self) -> dict:
+    """
+    Summarise the recorded triage decisions.
+
+    :return: A dictionary with the total, skipped and per-reason counts and the overall skip rate.
+    :rtype: dict
+    """
+    with self.lock:
+      counts = dict(self.counts)
+    total = sum(counts.values())
+    skipped = total - counts.get("analysed", 0)
+    return {
+      "total": total,
+      "skipped": skipped,
+      "skip_rate": skipped / total if total else 0.0,
+      "reasons": {reason: count for reason, count in counts.items() if reason != "analysed"}
+    }
+
+triage_stats = TriageStats()
+
+def get_triage_stats() -> dict:
+  """
+  Get the skip statistics recorded by the triage stage in this process.
+
+  :return: A dictionary with the total, skipped and per-reason counts and the overall skip rate.
+  :rtype: dict
+  """
+  return triage_stats.summary()
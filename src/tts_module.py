@@ -1,6 +1,31 @@
+import wave
 import pyttsx3
+from provider_module import get_model_provider
+
+class OfflineTTSEngine:
+  """
+  Stand-in for the pyttsx3 engine that writes silent WAV files.
+  """
+  def __init__(self, sample_rate=8000):
+    self.sample_rate = sample_rate
+    self.queue = []
+
+  def save_to_file(self, text, out_path):
+    self.queue.append((text, out_path))
+
+  def runAndWait(self):
+    for text, out_path in self.queue:
+      with wave.open(str(out_path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(self.sample_rate)
+        # roughly a tenth of a second of silence per word
+        wav.writeframes(b"\x00\x00" * (self.sample_rate // 10) * max(1, len(text.split())))
+    self.queue = []
 
 def get_tts_engine() -> pyttsx3:
+  if get_model_provider() == "offline":
+    return OfflineTTSEngine()
   return pyttsx3.init()
 
 def speak(text, out_path):